@@ -1,11 +1,19 @@
 from __future__ import annotations
+import collections
+import functools
+import hashlib
 import io
+import itertools
+import os
+import struct
+import time
 import zipfile
+import zlib
 import subprocess
 import sys
-import importlib
-from pathlib import Path
-from typing import Dict, List
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List
 
 try:
     import streamlit as st
@@ -13,7 +21,14 @@ try:
 except Exception:
     HAS_STREAMLIT = False
 
-from markitdown import MarkItDown
+try:
+    # libdeflate bindings (`pip install deflate`): much faster DEFLATE than the stdlib zlib
+    import deflate
+    HAS_LIBDEFLATE = True
+except Exception:
+    HAS_LIBDEFLATE = False
+
+from markitdown import MarkItDown, StreamInfo
 try:
     # Preferred public export
     from markitdown import FileConversionException, MissingDependencyException
@@ -28,65 +43,378 @@ except Exception:
         class MissingDependencyException(Exception):
             pass
 
+# the folder-walk skip list is shared with scripts/batch_convert.py
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "scripts"))
+from file_filter import is_convertible_file
+
+
+def _markdown(result) -> str:
+    text = getattr(result, "text_content", None)
+    return text if text is not None else str(result)
+
+
+def _convert_with(
+    converter: MarkItDown, source: str | BinaryIO, stream_info: StreamInfo | None = None
+) -> tuple[str, bool]:
+    """Convert a single path or binary stream with the given converter. Returns (markdown or error message, failed)."""
+    try:
+        return _markdown(converter.convert(source, stream_info=stream_info)), False
+    except FileConversionException as e:
+        return f"ERROR: {e}", True
+    except Exception as e:
+        return f"ERROR: {e}", True
+
+
+def _upload_info(name: str) -> StreamInfo:
+    # the upload's name supplies the extension hint that a path would otherwise give
+    return StreamInfo(filename=name, extension=os.path.splitext(name)[1] or None)
+
+
+def _convert_bytes(converter: MarkItDown, name: str, data: bytes | memoryview) -> tuple[str, bool]:
+    """Convert an in-memory file. Returns (markdown or error message, failed)."""
+    return _convert_with(converter, io.BytesIO(data), _upload_info(name))
+
+
+def _cached_convert(name: str, digest: str, _data: bytes | memoryview) -> str:
+    """Convert an upload with the shared converter, memoized on its name and content digest.
+
+    Failures raise, so they are not cached and a retry converts again.
+    """
+    return _markdown(_get_converter().convert(io.BytesIO(_data), stream_info=_upload_info(name)))
+
+
+def _convert_bytes_cached(name: str, data: bytes | memoryview) -> tuple[str, bool]:
+    """Like `_convert_bytes` with the shared converter, but re-uploads of identical content skip conversion."""
+    # hashing here keeps Streamlit from hashing the content itself; hashlib releases the GIL on large buffers
+    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+    try:
+        return _cached_convert(name, digest, data), False
+    except FileConversionException as e:
+        return f"ERROR: {e}", True
+    except Exception as e:
+        return f"ERROR: {e}", True
+
+
+def _get_converter() -> MarkItDown:
+    """Return the shared MarkItDown instance, built on first use."""
+    return MarkItDown()
+
+
+# Streamlit re-executes this module on every rerun; cache_resource keeps one instance across reruns and sessions
+# (no spinner: the prewarm thread below calls it outside any script run)
+if HAS_STREAMLIT:
+    _get_converter = st.cache_resource(show_spinner=False)(_get_converter)
+else:
+    _get_converter = functools.lru_cache(maxsize=1)(_get_converter)
+
 
-def convert_paths(paths: list[str]) -> Dict[str, str]:
-    """Convert local file paths to Markdown text. Returns mapping path->markdown or error message."""
-    converter = MarkItDown()
+def _prewarm_converter() -> threading.Thread:
+    """Build the shared converter on a daemon thread so the first Convert click does not pay for it."""
+    thread = threading.Thread(target=_get_converter, name="markitdown-prewarm", daemon=True)
+    thread.start()
+    return thread
+
+
+if HAS_STREAMLIT:
+    # cached so the thread starts once per server process rather than on every rerun; a Convert click that lands
+    # while it is still running waits on cache_resource's lock instead of building a second instance. Started from
+    # streamlit_app() rather than at import, so library use and process-pool workers never spawn it.
+    _prewarm_converter = st.cache_resource(show_spinner=False)(_prewarm_converter)
+
+
+_worker_converter: MarkItDown | None = None
+
+
+def _init_worker() -> None:
+    """Process pool initializer: build one converter per worker instead of one per file."""
+    global _worker_converter
+    _worker_converter = MarkItDown()
+
+
+def _convert_one(path: str) -> tuple[str, tuple[str, bool]]:
+    """Worker entry point; uses the converter set up by `_init_worker` so nothing is pickled across processes."""
+    return path, _convert_with(_worker_converter, path)
+
+
+def convert_paths(
+    paths: list[str],
+    converter: MarkItDown | None = None,
+    progress: Callable[[int, int, str], None] | None = None,
+    errors: set[str] | None = None,
+) -> Dict[str, str]:
+    """Convert local file paths to Markdown text. Returns mapping path->markdown or error message.
+
+    With an injected `converter`, files are converted on threads sharing it. Otherwise they are spread across
+    worker processes, each with its own converter; a single path is converted in-process with the shared one.
+    `progress(done, total, path)` is called on the calling thread after each file. Paths whose conversion failed
+    are added to `errors`, if given.
+    """
+    if converter is not None:
+        jobs = {p: functools.partial(_convert_with, converter, p) for p in paths}
+        return _convert_all(jobs, progress, errors)
+    total = len(paths)
     out: Dict[str, str] = {}
-    for p in paths:
-        try:
-            result = converter.convert(p)
-            text = getattr(result, "text_content", None)
-            out[p] = text if text is not None else str(result)
-        except FileConversionException as e:
-            out[p] = f"ERROR: {e}"
-        except Exception as e:
-            out[p] = f"ERROR: {e}"
+
+    def collect(converted: Iterable[tuple[str, tuple[str, bool]]]) -> None:
+        for i, (p, (txt, failed)) in enumerate(converted, start=1):
+            out[p] = txt
+            if failed and errors is not None:
+                errors.add(p)
+            if progress is not None:
+                progress(i, total, p)
+
+    if total <= 1:
+        collect((p, _convert_with(_get_converter(), p)) for p in paths)
+    else:
+        with ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=_init_worker) as ex:
+            collect(ex.map(_convert_one, paths, chunksize=4))
     return out
 
 
-def install_markitdown_extras(extras: List[str]) -> tuple[bool, str]:
+def iter_folder(root: str, recursive: bool) -> Iterator[str]:
+    """Yield paths of the files under `root`, descending into subfolders if `recursive`."""
+    # os.scandir reports the entry type from the directory listing, avoiding a Path and a stat() per entry
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for e in it:
+                if e.is_dir(follow_symlinks=False):
+                    if recursive:
+                        stack.append(e.path)
+                elif e.is_file():
+                    yield e.path
+
+
+def convert_uploads(
+    files: Dict[str, bytes | memoryview],
+    converter: MarkItDown | None = None,
+    progress: Callable[[int, int, str], None] | None = None,
+    errors: set[str] | None = None,
+) -> Dict[str, str]:
+    """Convert in-memory files (name -> content) to Markdown text without writing them to disk.
+
+    Files are converted on threads sharing `converter`. Without one, the shared instance is used and, under
+    Streamlit, results are memoized on a digest of the content. Returns mapping name->markdown or error message;
+    `progress(done, total, name)` is called on the calling thread after each file. Names whose conversion failed
+    are added to `errors`, if given.
+    """
+    if converter is None:
+        jobs = {name: functools.partial(_convert_bytes_cached, name, data) for name, data in files.items()}
+    else:
+        jobs = {name: functools.partial(_convert_bytes, converter, name, data) for name, data in files.items()}
+    return _convert_all(jobs, progress, errors)
+
+
+def _convert_all(
+    jobs: Dict[str, Callable[[], tuple[str, bool]]],
+    progress: Callable[[int, int, str], None] | None = None,
+    errors: set[str] | None = None,
+) -> Dict[str, str]:
+    """Run conversion jobs (name -> callable returning (markdown or error message, failed)) on worker threads.
+
+    Threads let I/O-bound conversions (remote transcription, LLM captioning) overlap. `progress(done, total, name)`
+    is called on the calling thread as each job finishes, in completion order. Results keep the order of `jobs`;
+    names of failed jobs are added to `errors`, if given.
+    """
+    total = len(jobs)
+    finished: Dict[str, str] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(16, total))) as ex:
+        futures = {ex.submit(job): name for name, job in jobs.items()}
+        for i, fut in enumerate(as_completed(futures), start=1):
+            name = futures[fut]
+            finished[name], failed = fut.result()
+            if failed and errors is not None:
+                errors.add(name)
+            if progress is not None:
+                progress(i, total, name)
+    return {name: finished[name] for name in jobs}
+
+
+MARKITDOWN_EXTRAS = ["all", "pdf", "docx", "pptx", "xlsx", "xls", "outlook", "audio-transcription", "youtube-transcription", "az-doc-intel"]
+
+
+def install_markitdown_extras(extras: List[str], on_output: Callable[[str], None] | None = None) -> tuple[bool, str]:
     """Install optional markitdown extras into the running environment.
 
-    Returns (success, output).
+    pip's output is passed to `on_output` line by line as it is produced. Returns (success, output), where output
+    holds the last lines of pip's log rather than the whole of it.
     """
     if not extras:
         return False, "No extras selected"
     pkg = f"markitdown[{','.join(extras)}]"
     try:
-        # Use the same Python executable running the app
-        cmd = [sys.executable, "-m", "pip", "install", pkg]
-        proc = subprocess.run(cmd, capture_output=True, text=True)
-        out = proc.stdout + "\n" + proc.stderr
-        if proc.returncode == 0:
-            # attempt to reload markitdown package so new deps are picked up
-            try:
-                import markitdown as _m
-                importlib.reload(_m)
-            except Exception:
-                pass
-            return True, out
-        return False, out
+        # Use the same Python executable running the app; prefer wheels to avoid slow source builds
+        cmd = [sys.executable, "-m", "pip", "install", "-q", "--progress-bar=off", "--prefer-binary", pkg]
+        tail: collections.deque[str] = collections.deque(maxlen=50)
+        with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1) as proc:
+            for line in proc.stdout:
+                line = line.rstrip()
+                tail.append(line)
+                if on_output is not None:
+                    on_output(line)
+        # markitdown is not reloaded in place: converters import their dependencies at module load, so a reload
+        # would re-execute every module and still miss them. The app has to be restarted instead (see restart_app).
+        return proc.returncode == 0, "\n".join(tail)
     except Exception as e:
         return False, str(e)
 
 
-def make_zip_from_dict(contents: Dict[str, str]) -> bytes:
-    """Create an in-memory ZIP from a dict name->text and return bytes."""
-    bio = io.BytesIO()
-    with zipfile.ZipFile(bio, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+def restart_app() -> None:
+    """Re-exec the command that started this process, so newly installed extras are imported cleanly.
+
+    Every flag the app was launched with (address, port, base URL path, ...) carries over unchanged.
+    """
+    # orig_argv[0] may be a bare "python"; sys.executable is the resolved interpreter. The working directory is
+    # unchanged across exec, so relative paths in the original command still resolve.
+    os.execv(sys.executable, [sys.executable] + sys.orig_argv[1:])
+
+
+_ZIP_LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+_ZIP_CENTRAL_HEADER = struct.Struct("<IHHHHHHIIIHHHHHII")
+_ZIP_END_RECORD = struct.Struct("<IHHHHIIH")
+_ZIP_UTF8_FLAG = 0x800
+_ZIP_MAX_ENTRIES = 0xFFFF
+_ZIP_MAX_SIZE = 0xFFFFFFFF
+
+
+def _zip_member_name(name: str) -> str:
+    # os.path rather than Path: this runs once per result and Path construction is comparatively costly
+    base = os.path.basename(name)
+    return os.path.splitext(base)[0] + ".md"
+
+
+def _dos_datetime(ts: float) -> tuple[int, int]:
+    t = time.localtime(ts)
+    return ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday, (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+
+
+def _zip_member(item: tuple[str, str], level: int) -> tuple[bytes, bytes, int, int]:
+    """Compress one ZIP member as raw DEFLATE. Returns (encoded name, compressed data, crc32, uncompressed size)."""
+    name, text = item
+    raw = text.encode("utf-8")
+    md_name = _zip_member_name(name).encode("utf-8")
+    if HAS_LIBDEFLATE:
+        return md_name, deflate.deflate_compress(raw, level), deflate.crc32(raw), len(raw)
+    # negative wbits: raw DEFLATE without the zlib header, as ZIP stores it
+    co = zlib.compressobj(min(level, 9), zlib.DEFLATED, -15)
+    return md_name, co.compress(raw) + co.flush(), zlib.crc32(raw), len(raw)
+
+
+class _Zip64Required(Exception):
+    pass
+
+
+def _compressed_members(contents: Dict[str, str], level: int) -> Iterator[tuple[bytes, bytes, int, int]]:
+    """Yield `_zip_member` results in order, compressing on a thread pool (libdeflate and zlib both release the GIL).
+
+    Only a small window of members is submitted ahead of the one being consumed, so at most that many compressed
+    members are held in memory at once, however large the archive.
+    """
+    items = iter(contents.items())
+    if len(contents) <= 1:
+        yield from (_zip_member(item, level) for item in items)
+        return
+    workers = min(len(contents), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        ahead = itertools.islice(items, 2 * workers)
+        window = collections.deque(ex.submit(_zip_member, item, level) for item in ahead)
+        while window:
+            member = window.popleft().result()
+            for item in itertools.islice(items, 1):
+                window.append(ex.submit(_zip_member, item, level))
+            yield member
+
+
+def _write_zip_members(fh: BinaryIO, contents: Dict[str, str], level: int) -> None:
+    """Write the ZIP by hand from pre-compressed members. Raises _Zip64Required past the classic ZIP limits.
+
+    zipfile always compresses what it is given and runs its streaming-write machinery per member, so the local
+    headers, central directory and end record are packed here directly, writing each member as it is compressed.
+    """
+    if len(contents) > _ZIP_MAX_ENTRIES:
+        raise _Zip64Required
+    dos_date, dos_time = _dos_datetime(time.time())
+    start = fh.tell()
+    central: list[bytes] = []
+    for md_name, comp, crc, size in _compressed_members(contents, level):
+        offset = fh.tell() - start
+        if size > _ZIP_MAX_SIZE or offset > _ZIP_MAX_SIZE:
+            raise _Zip64Required
+        fields = (20, _ZIP_UTF8_FLAG, zipfile.ZIP_DEFLATED, dos_time, dos_date, crc, len(comp), size, len(md_name))
+        fh.write(_ZIP_LOCAL_HEADER.pack(0x04034B50, *fields, 0) + md_name)
+        fh.write(comp)
+        central.append(_ZIP_CENTRAL_HEADER.pack(0x02014B50, 20, *fields, 0, 0, 0, 0, 0, offset) + md_name)
+    cd_offset = fh.tell() - start
+    fh.write(b"".join(central))
+    cd_size = fh.tell() - start - cd_offset
+    if cd_offset + cd_size > _ZIP_MAX_SIZE:
+        raise _Zip64Required
+    fh.write(_ZIP_END_RECORD.pack(0x06054B50, 0, 0, len(central), len(central), cd_size, cd_offset, 0))
+
+
+def write_zip(fh: BinaryIO, contents: Dict[str, str], level: int = 1) -> None:
+    """Write a ZIP of `contents` (name -> text, stored as <stem>.md) to the seekable binary file `fh`.
+
+    `level` is the DEFLATE level: 1 (fastest, the default for interactive downloads) to 12 with libdeflate,
+    clamped to 9 for zlib. Archives too large for the hand-built writer are rewritten with zipfile, which handles
+    ZIP64. Writing to a file instead of memory keeps large archives out of RAM.
+    """
+    start = fh.tell()
+    try:
+        _write_zip_members(fh, contents, level)
+        return
+    except _Zip64Required:
+        fh.seek(start)
+        fh.truncate()
+    with zipfile.ZipFile(fh, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=min(level, 9)) as zf:
         for name, text in contents.items():
-            safe_name = Path(name).name
-            md_name = f"{Path(safe_name).stem}.md"
-            zf.writestr(md_name, text)
-    bio.seek(0)
-    return bio.read()
+            zf.writestr(_zip_member_name(name), text)
+
+
+def make_zip_from_dict(contents: Dict[str, str], level: int = 1) -> bytes:
+    """Create an in-memory ZIP from a dict name->text and return bytes. See `write_zip` for `level`."""
+    bio = io.BytesIO()
+    write_zip(bio, contents, level)
+    # getvalue() hands over the buffer without copying when nothing else references it
+    return bio.getvalue()
+
+
+def _results_key(results: Dict[str, str]) -> str:
+    """Fingerprint of a result set, used as the cache key for its ZIP."""
+    h = hashlib.blake2b(digest_size=16)
+    for name, text in results.items():
+        for part in (name, text):
+            data = part.encode("utf-8")
+            h.update(len(data).to_bytes(8, "little"))
+            h.update(data)
+    return h.hexdigest()
+
+
+def _zip_for(key: str, _contents: Dict[str, str], level: int) -> bytes:
+    """ZIP for the result set identified by `key`.
+
+    Streamlit skips hashing underscore-prefixed arguments, so the cache is keyed on `key` and `level` only.
+    """
+    return make_zip_from_dict(_contents, level=level)
+
+
+if HAS_STREAMLIT:
+    # cache_resource rather than cache_data: bytes are immutable, so the cached object can be handed out as is
+    # instead of being pickled into the cache and unpickled into a fresh copy on every rerun
+    _zip_for = st.cache_resource(max_entries=4)(_zip_for)
+    # called from conversion threads, which have no script context to show a spinner in
+    _cached_convert = st.cache_data(max_entries=128, show_spinner=False)(_cached_convert)
 
 
 def streamlit_app() -> None:
     if not HAS_STREAMLIT:
         raise RuntimeError("Streamlit is not installed in this environment. Install it with `pip install streamlit`.")
 
+    _prewarm_converter()
     st.set_page_config(page_title="MarkItDown - Batch Converter", layout="wide")
     st.title("MarkItDown — Batch converter")
 
@@ -95,26 +423,51 @@ def streamlit_app() -> None:
         st.session_state['converted_results'] = None
     if 'zip_bytes' not in st.session_state:
         st.session_state['zip_bytes'] = None
+    if 'conversion_errors' not in st.session_state:
+        st.session_state['conversion_errors'] = frozenset()
+    if 'converted_results_hash' not in st.session_state:
+        st.session_state['converted_results_hash'] = None
+    if 'zip_key' not in st.session_state:
+        st.session_state['zip_key'] = None
 
     uploaded = st.file_uploader("Upload files (or select a folder via path below)", accept_multiple_files=True)
     st.write("Or provide a folder path (server-side):")
     folder = st.text_input("Folder path (optional)")
 
     recurse = st.checkbox("Recurse into subfolders", value=True)
+    only_supported = st.checkbox("Skip folder files that are not documents (lock files, binaries, ...)", value=True)
+    zip_level = st.slider("ZIP compression level", 1, 12 if HAS_LIBDEFLATE else 9, 1, help="Higher levels give smaller ZIPs but take longer to build")
 
     convert_button = st.button("Convert uploaded / folder files")
 
+    with st.expander("Install optional format support", expanded=False):
+        extras = st.multiselect("MarkItDown extras", MARKITDOWN_EXTRAS)
+        if st.button("Install selected extras"):
+            log = st.empty()
+            ok, out = install_markitdown_extras(extras, on_output=log.text)
+            if ok:
+                log.success(f"Installed markitdown[{','.join(extras)}]")
+                st.session_state['needs_restart'] = True
+            else:
+                log.error("Installation failed")
+                st.code(out)
+
+    if st.session_state.get('needs_restart'):
+        st.warning("Restart the app to activate new extras")
+        if st.button("Restart"):
+            restart_app()
+
     # Inline summary (removed sidebar)
     def render_inline_summary():
         if st.session_state.get('converted_results'):
             results_sb = st.session_state['converted_results']
+            errors = st.session_state['conversion_errors']
             total = len(results_sb)
-            success = sum(1 for v in results_sb.values() if not str(v).startswith('ERROR:'))
-            st.markdown(f"**Files converted:** {success}/{total}")
+            st.markdown(f"**Files converted:** {total - len(errors)}/{total}")
             with st.expander("Converted files (click to expand)", expanded=False):
-                for p, txt in results_sb.items():
-                    label = Path(p).name
-                    if str(txt).startswith('ERROR:'):
+                for p in results_sb:
+                    label = os.path.basename(p)
+                    if p in errors:
                         st.write(f"❌ {label}")
                     else:
                         st.write(f"✅ {label}")
@@ -125,73 +478,84 @@ def streamlit_app() -> None:
     # note: render summary and download AFTER any conversion so updated session_state is shown immediately
 
     if convert_button:
+        # uploads are already in memory, so they are converted from their buffers rather than via temp files
+        uploads: Dict[str, memoryview] = {f.name: f.getbuffer() for f in uploaded} if uploaded else {}
         paths: list[str] = []
-        temp_dir = Path(".") / "converted_streamlit_tmp"
-        temp_dir.mkdir(exist_ok=True)
-
-        if uploaded:
-            for f in uploaded:
-                dst = temp_dir / f.name
-                with open(dst, "wb") as fh:
-                    fh.write(f.getbuffer())
-                paths.append(str(dst))
 
         if folder:
-            p = Path(folder)
-            if p.exists() and p.is_dir():
-                # include all files by default
-                it = p.rglob("*") if recurse else p.iterdir()
-                for fp in it:
-                    if fp.is_file():
-                        paths.append(str(fp))
+            if os.path.isdir(folder):
+                found = list(iter_folder(folder, recurse))
+                if only_supported:
+                    # skip OS metadata, lock files, binaries and the like up front instead of converting them to errors
+                    paths.extend(p for p in found if is_convertible_file(p))
+                    if len(found) > len(paths):
+                        st.info(f"Skipped {len(found) - len(paths)} folder file(s) that are not documents")
+                else:
+                    paths.extend(found)
             else:
                 st.error("Folder path does not exist or is not a directory")
 
-        if not paths:
+        if not uploads and not paths:
             st.warning("No files to convert")
             return
 
         status = st.empty()
+
+        # uploads and folder files are converted in two calls; progress counts across both
+        grand_total = len(uploads) + len(paths)
+
+        def report(done: int, total: int, p: str, offset: int = 0) -> None:
+            status.info(f"Converted {offset + done}/{grand_total}: {p}")
+
         results: Dict[str, str] = {}
-        total = len(paths)
-        for i, p in enumerate(paths, start=1):
-            status.info(f"Converting {i}/{total}: {p}")
-            try:
-                res = convert_paths([p])
-                results.update(res)
-            except Exception as e:
-                results[p] = f"ERROR: {e}"
+        # failures are recorded where the exception is caught, not guessed from the text afterwards
+        errors: set[str] = set()
+        if uploads:
+            # no converter passed: the shared one is used and repeat uploads are served from the cache
+            results.update(convert_uploads(uploads, progress=report, errors=errors))
+        if paths:
+            folder_report = functools.partial(report, offset=len(uploads))
+            results.update(convert_paths(paths, converter=_get_converter(), progress=folder_report, errors=errors))
 
         status.success("Conversion finished")
 
-        # store results in session state so UI can render tabs and sidebar download
-        st.session_state['converted_results'] = results
-        zip_bytes = make_zip_from_dict(results)
-        st.session_state['zip_bytes'] = zip_bytes
+        # store results in session state so UI can render tabs and sidebar download; re-converting the same
+        # inputs yields the same fingerprint, in which case the stored results (and their ZIP) are kept as they are
+        results_hash = _results_key(results)
+        if results_hash != st.session_state['converted_results_hash']:
+            st.session_state['converted_results'] = results
+            st.session_state['converted_results_hash'] = results_hash
+        # kept next to the results so reruns count and flag failures without rescanning any text
+        st.session_state['conversion_errors'] = frozenset(errors)
 
     # Render converted results as tabs (persistent across reruns)
     results_to_show = st.session_state.get('converted_results')
     if results_to_show:
         # create tabs for each file
-        file_names = [Path(p).name for p in results_to_show.keys()]
+        file_names = [os.path.basename(p) for p in results_to_show]
         tabs = st.tabs(file_names)
-        for tab, (p, text) in zip(tabs, results_to_show.items()):
+        errors = st.session_state['conversion_errors']
+        for tab, label, (p, text) in zip(tabs, file_names, results_to_show.items()):
             with tab:
-                st.subheader(Path(p).name)
+                st.subheader(label)
                 # Use an expander so the user can minimize/maximize the markdown view
                 with st.expander("View Markdown", expanded=False):
-                    if str(text).startswith('ERROR:'):
+                    if p in errors:
                         st.error(text)
                     else:
                         st.markdown(text)
 
         # After rendering tabs, show inline summary and prominent download button
         render_inline_summary()
-        # Ensure ZIP exists
-        if not st.session_state.get('zip_bytes') and st.session_state.get('converted_results'):
+        # Ensure ZIP exists; only rebuilt (or fetched from the memo) when the results or the level changed
+        zip_key = (st.session_state['converted_results_hash'], zip_level)
+        if st.session_state['zip_key'] != zip_key:
             try:
-                st.session_state['zip_bytes'] = make_zip_from_dict(st.session_state['converted_results'])
+                st.session_state['zip_bytes'] = _zip_for(zip_key[0], results_to_show, zip_level)
+                st.session_state['zip_key'] = zip_key
             except Exception as e:
+                st.session_state['zip_bytes'] = None
+                st.session_state['zip_key'] = None
                 st.error(f"Could not create ZIP: {e}")
 
         if st.session_state.get('zip_bytes'):
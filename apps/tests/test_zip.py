@@ -0,0 +1,82 @@
+#!/usr/bin/env python3 -m pytest
+import io
+import os
+import sys
+import tempfile
+import zipfile
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import streamlit_app  # noqa: E402
+
+# Round-trip tests for the hand-built ZIP writer behind the download button: every archive must be readable by
+# zipfile, pass its CRC checks, and hold exactly the converted texts.
+
+CONTENTS = {
+    "/data/report.pdf": "# Report\n\n" + "Lorem ipsum dolor sit amet. " * 500,
+    "notes.docx": "Some notes",
+    "ünïcödé name.html": "Ünïcödé — text ✓",
+    "empty.txt": "",
+}
+
+BACKENDS = [
+    pytest.param(False, id="zlib"),
+    pytest.param(
+        True,
+        id="libdeflate",
+        marks=pytest.mark.skipif(
+            not streamlit_app.HAS_LIBDEFLATE, reason="deflate is not installed"
+        ),
+    ),
+]
+
+
+def validate_zip(data: bytes, contents: dict) -> None:
+    expected = {
+        os.path.splitext(os.path.basename(name))[0] + ".md": text
+        for name, text in contents.items()
+    }
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        assert zf.testzip() is None
+        assert zf.namelist() == list(expected)
+        for name, text in expected.items():
+            assert zf.read(name).decode("utf-8") == text
+
+
+@pytest.mark.parametrize("use_libdeflate", BACKENDS)
+@pytest.mark.parametrize("level", [1, 6, 9, 12])
+def test_zip_round_trip(monkeypatch, use_libdeflate: bool, level: int) -> None:
+    monkeypatch.setattr(streamlit_app, "HAS_LIBDEFLATE", use_libdeflate)
+    for contents in [{}, {"single.pdf": "only one"}, CONTENTS]:
+        validate_zip(streamlit_app.make_zip_from_dict(contents, level=level), contents)
+
+
+@pytest.mark.parametrize("use_libdeflate", BACKENDS)
+def test_zip_many_members(monkeypatch, use_libdeflate: bool) -> None:
+    # More members than the compression window, so members are submitted while earlier ones are written
+    monkeypatch.setattr(streamlit_app, "HAS_LIBDEFLATE", use_libdeflate)
+    contents = {f"file{i}.txt": f"text {i}\n" * i for i in range(200)}
+    validate_zip(streamlit_app.make_zip_from_dict(contents), contents)
+
+
+@pytest.mark.parametrize("limit", ["_ZIP_MAX_ENTRIES", "_ZIP_MAX_SIZE"])
+def test_zip64_fallback(monkeypatch, limit: str) -> None:
+    # Lowering the classic ZIP limits forces the zipfile fallback without building a multi-gigabyte archive
+    monkeypatch.setattr(streamlit_app, limit, 2)
+    validate_zip(streamlit_app.make_zip_from_dict(CONTENTS), CONTENTS)
+
+
+def test_write_zip_to_file(monkeypatch) -> None:
+    # The fallback rewinds to where the archive started, leaving data before it in the file untouched
+    monkeypatch.setattr(streamlit_app, "_ZIP_MAX_SIZE", 2)
+    with tempfile.TemporaryFile() as fh:
+        fh.write(b"prefix")
+        streamlit_app.write_zip(fh, CONTENTS)
+        fh.seek(0)
+        assert fh.read(6) == b"prefix"
+        validate_zip(fh.read(), CONTENTS)
+
+
+if __name__ == "__main__":
+    """Runs this file's tests from the command line."""
+    sys.exit(pytest.main([__file__]))
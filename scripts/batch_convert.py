@@ -3,36 +3,248 @@
 
 Usage examples:
   python scripts/batch_convert.py --input packages/markitdown/tests/test_files --output converted/batch_demo --recursive
+  python scripts/batch_convert.py --input docs --output converted/docs --io-uring   # Linux, needs `pip install liburing`
 """
 from __future__ import annotations
 import argparse
+import io
+import math
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from markitdown import MarkItDown
+from typing import Collection, Iterator
+from markitdown import MarkItDown, StreamInfo
 from markitdown._exceptions import FileConversionException
+from file_filter import is_convertible_file
 
+try:
+    import liburing
+    HAS_LIBURING = sys.platform.startswith("linux")
+except Exception:
+    HAS_LIBURING = False
 
-def iter_files(root: Path, extensions: list[str] | None, recursive: bool):
-    if recursive:
-        it = root.rglob("*")
-    else:
-        it = root.iterdir()
-    for p in it:
-        if not p.is_file():
+# Files read per io_uring round trip; each file takes two submission slots per phase
+URING_BATCH = 64
+# Bytes a worker reads ahead of conversion; a single larger file is still read, on its own
+URING_BATCH_BYTES = 64 * 1024 * 1024
+
+
+def iter_files(root: Path, extensions: Collection[str] | None, recursive: bool) -> Iterator[str]:
+    # os.scandir reports the entry type from the directory listing, avoiding a Path and a stat() per entry
+    stack = [str(root)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
             continue
-        if extensions:
-            if p.suffix.lower() in extensions:
-                yield p
+        with it:
+            for e in it:
+                if e.is_dir(follow_symlinks=False):
+                    if recursive:
+                        stack.append(e.path)
+                elif e.is_file():
+                    if not extensions or os.path.splitext(e.name)[1].lower() in extensions:
+                        yield e.path
+
+
+class UringReader:
+    """Read whole files through io_uring, batching the open/statx/read/close syscalls of many files.
+
+    Each batch costs two ring round trips: openat + statx for every file, then read + close for every file.
+    Results map path -> bytes, or the OSError that file hit.
+    """
+
+    def __init__(self, depth: int = 2 * URING_BATCH):
+        self._depth = depth
+        self._ring = liburing.Ring()
+        self._cqe = liburing.Cqe()
+        liburing.io_uring_queue_init(depth, self._ring)
+
+    def close(self) -> None:
+        liburing.io_uring_queue_exit(self._ring)
+
+    def __enter__(self) -> UringReader:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _reap(self, count: int) -> dict[int, int | OSError]:
+        """Submit queued SQEs and collect `count` completions keyed by user_data."""
+        liburing.io_uring_submit_and_wait(self._ring, count)
+        out: dict[int, int | OSError] = {}
+        while len(out) < count:
+            try:
+                liburing.io_uring_peek_cqe(self._ring, self._cqe)
+            except BlockingIOError:
+                liburing.io_uring_submit_and_wait(self._ring, 1)
+                continue
+            # one entry at a time: indexing past cqe[0] does not follow the ring's wrap-around
+            cqe = self._cqe[0]
+            try:
+                out[cqe.user_data] = cqe.res
+            except OSError as e:  # negative results surface as exceptions
+                out[cqe.user_data] = e
+            liburing.io_uring_cq_advance(self._ring, 1)
+        return out
+
+    def _prep(self, user_data: int):
+        sqe = liburing.io_uring_get_sqe(self._ring)
+        liburing.io_uring_sqe_set_data64(sqe, user_data)
+        return sqe
+
+    def read_files(self, paths: list[str]) -> Iterator[tuple[str, bytearray | bytes | OSError]]:
+        """Yield (path, content or the OSError it hit) in input order.
+
+        Contents are read at most URING_BATCH_BYTES ahead of the consumer, and each buffer is handed over as is.
+        """
+        step = self._depth // 2
+        for start in range(0, len(paths), step):
+            yield from self._read_batch(paths[start:start + step])
+
+    def _read_batch(self, paths: list[str]) -> Iterator[tuple[str, bytearray | bytes | OSError]]:
+        stats = [liburing.Statx() for _ in paths]
+        for i, path in enumerate(paths):
+            liburing.io_uring_prep_open(self._prep(2 * i), path, os.O_RDONLY | os.O_CLOEXEC)
+            liburing.io_uring_prep_statx(self._prep(2 * i + 1), stats[i], path)
+        opened = self._reap(2 * len(paths))
+
+        # path index -> open fd still to be read, or the OSError its open/statx hit
+        pending: dict[int, int | OSError] = {}
+        for i in range(len(paths)):
+            fd, stat = opened[2 * i], opened[2 * i + 1]
+            if not isinstance(fd, OSError) and isinstance(stat, OSError):
+                os.close(fd)
+                fd = stat
+            pending[i] = fd
+        try:
+            # read in groups of consecutive files capped by total size (a larger file forms a group of its own),
+            # yielding each group before reading the next
+            group: list[int] = []
+            size = 0
+            for i in range(len(paths)):
+                file_size = 0 if isinstance(pending[i], OSError) else stats[i].size
+                if group and size + file_size > URING_BATCH_BYTES:
+                    yield from self._read_group(paths, stats, pending, group)
+                    group, size = [], 0
+                group.append(i)
+                size += file_size
+            yield from self._read_group(paths, stats, pending, group)
+        finally:
+            # the consumer stopped early: close what was opened but never read
+            for fd in pending.values():
+                if not isinstance(fd, OSError):
+                    os.close(fd)
+
+    def _read_group(
+        self, paths: list[str], stats: list, pending: dict[int, int | OSError], group: list[int],
+    ) -> Iterator[tuple[str, bytearray | bytes | OSError]]:
+        buffers: dict[int, bytearray] = {}
+        for i in group:
+            fd = pending[i]
+            if isinstance(fd, OSError):
+                continue
+            # one byte beyond the stat'ed size, so a file that grew since the statx shows up as a long read
+            buffers[i] = bytearray(stats[i].size + 1)
+            read_sqe = self._prep(2 * i)
+            liburing.io_uring_prep_read(read_sqe, fd, buffers[i], 0)
+            # hard link so the close only runs once the read has finished, even if the read fails
+            liburing.io_uring_sqe_set_flags(read_sqe, liburing.IOSQE_IO_HARDLINK)
+            liburing.io_uring_prep_close(self._prep(2 * i + 1), fd)
+        read = self._reap(2 * len(buffers)) if buffers else {}
+        # the ring has closed every fd in the group; nothing is left for _read_batch to clean up
+        opened = {i: pending.pop(i) for i in group}
+        for i in group:
+            fd = opened[i]
+            if isinstance(fd, OSError):
+                yield paths[i], fd
+                continue
+            # popped so the buffer is freed once the consumer is done with it
+            buf, n = buffers.pop(i), read[2 * i]
+            if isinstance(n, OSError):
+                yield paths[i], n
+            elif n != stats[i].size:
+                # the file changed size under us, or is larger than one read can return: read it the plain way
+                try:
+                    with open(paths[i], "rb") as fh:
+                        yield paths[i], fh.read()
+                except OSError as e:
+                    yield paths[i], e
+            else:
+                del buf[n:]  # trim the spare byte in place
+                yield paths[i], buf
+
+
+_worker_converter: MarkItDown | None = None
+_worker_reader: UringReader | None = None
+
+
+def _init_worker(use_io_uring: bool = False) -> None:
+    """Process pool initializer: build one converter (and io_uring reader) per worker instead of one per file."""
+    global _worker_converter, _worker_reader
+    _worker_converter = MarkItDown()
+    if use_io_uring:
+        try:
+            # the ring is released by the kernel when the worker exits
+            _worker_reader = UringReader()
+        except OSError as e:
+            print(f"io_uring unavailable ({e}); reading files normally", file=sys.stderr)
+
+
+def _convert_one(path: str, data: bytes | bytearray | OSError | None = None) -> tuple[str, str | None, str | None]:
+    """Convert one file in a worker process, from `data` when it was read ahead. Returns (path, text, error message)."""
+    # Exceptions are flattened to strings: FileConversionException carries tracebacks that cannot be pickled
+    try:
+        if isinstance(data, OSError):
+            raise data
+        if data is None:
+            result = _worker_converter.convert(path)
         else:
-            yield p
+            base = os.path.basename(path)
+            info = StreamInfo(local_path=path, filename=base, extension=os.path.splitext(base)[1] or None)
+            result = _worker_converter.convert_stream(io.BytesIO(data), stream_info=info)
+        text = getattr(result, 'text_content', None)
+        if text is None:
+            text = str(result)
+        return path, text, None
+    except FileConversionException as e:
+        return path, None, f"Failed to convert {path}: {e}"
+    except Exception as e:
+        return path, None, f"Error converting {path}: {e}"
+
+
+def _convert_batch(paths: list[str]) -> list[tuple[str, str | None, str | None]]:
+    """Convert a batch of files in a worker process, reading them through io_uring when the worker has a ring."""
+    if _worker_reader is None:
+        return [_convert_one(path) for path in paths]
+    # each file is converted as soon as it is read, so the reader's read-ahead bounds what is held in memory
+    return [_convert_one(path, data) for path, data in _worker_reader.read_files(paths)]
+
+
+# O_BINARY keeps Windows from translating newlines at the fd level; it does not exist (and is not needed) on POSIX
+_OUTPUT_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_CLOEXEC", 0) | getattr(os, "O_BINARY", 0)
+
+
+def write_output(out_path: Path, text: str) -> None:
+    """Write `text` as UTF-8, in a single write() for all but very large outputs."""
+    data = memoryview(text.encode("utf-8"))
+    fd = os.open(out_path, _OUTPUT_FLAGS, 0o644)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
 
 
 def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Batch convert files to Markdown using MarkItDown")
     parser.add_argument("--input", "-i", required=True, help="Input directory containing files to convert")
     parser.add_argument("--output", "-o", required=True, help="Output directory for generated .md files")
-    parser.add_argument("--extensions", "-e", nargs="*", help="Optional list of file extensions to include (e.g. .pdf .xlsx). If omitted, all files are attempted.")
+    parser.add_argument("--extensions", "-e", nargs="*", help="Optional list of file extensions to include (e.g. .pdf .xlsx). If omitted, files known not to be documents (lock files, binaries, fonts, ...) are skipped.")
+    parser.add_argument("--all-files", action="store_true", help="Attempt every file, including those known not to be documents")
     parser.add_argument("--recursive", "-r", action="store_true", help="Recurse into subdirectories")
+    parser.add_argument("--io-uring", action="store_true", help="Read input files in batches through io_uring (Linux only, requires the liburing package)")
     args = parser.parse_args(argv)
 
     input_dir = Path(args.input)
@@ -46,25 +258,56 @@ def main(argv: list[str] | None = None) -> int:
     if args.extensions:
         exts = [e.lower() if e.startswith('.') else f'.{e.lower()}' for e in args.extensions]
 
-    converter = MarkItDown()
-    total = 0
+    use_io_uring = args.io_uring and HAS_LIBURING
+    if args.io_uring and not use_io_uring:
+        print("io_uring is not available (needs Linux and `pip install liburing`); reading files normally", file=sys.stderr)
+
+    files = list(iter_files(input_dir, exts, args.recursive))
+    if not args.all_files and not args.extensions:
+        # skip OS metadata, lock files, binaries and the like up front instead of letting MarkItDown reject each one
+        found = len(files)
+        files = [path for path in files if is_convertible_file(path)]
+        if found > len(files):
+            print(f"Skipping {found - len(files)} file(s) that are not documents (use --all-files to attempt them)")
+    # inputs that share a stem (report.pdf, report.docx) would race for the same .md; the first in sorted order
+    # keeps it and the others are reported rather than overwriting it in whatever order the workers finish
+    files.sort()
+    out_paths: dict[str, Path] = {}
+    claimed: dict[Path, str] = {}
+    for path in files:
+        out_path = output_dir / f"{os.path.splitext(os.path.basename(path))[0]}.md"
+        if out_path in claimed:
+            print(f"Not converting {path}: {out_path} is already the output of {claimed[out_path]}", file=sys.stderr)
+        else:
+            claimed[out_path] = path
+            out_paths[path] = out_path
+    total = len(files)
+    files = list(out_paths)
     success = 0
-    for path in iter_files(input_dir, exts, args.recursive):
-        total += 1
-        out_name = f"{path.stem}.md"
-        out_path = output_dir / out_name
-        try:
-            result = converter.convert(str(path))
-            text = getattr(result, 'text_content', None)
-            if text is None:
-                text = str(result)
-            out_path.write_text(text, encoding="utf-8")
-            print(f"Converted: {path} -> {out_path}")
-            success += 1
-        except FileConversionException as e:
-            print(f"Failed to convert {path}: {e}", file=sys.stderr)
-        except Exception as e:
-            print(f"Error converting {path}: {e}", file=sys.stderr)
+    # with io_uring, workers take files in batches so each ring round trip covers many files, but never so few
+    # batches that some workers sit idle
+    workers = os.cpu_count() or 1
+    batch = max(1, min(URING_BATCH, math.ceil(len(files) / workers))) if use_io_uring else 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(use_io_uring,)) as ex:
+        futures = {ex.submit(_convert_batch, files[i:i + batch]): files[i:i + batch] for i in range(0, len(files), batch)}
+        for fut in as_completed(futures):
+            try:
+                converted = fut.result()
+            except Exception as e:
+                # a failure outside the per-file handling (e.g. a worker dying) takes its whole batch with it
+                converted = [(path, None, f"Error converting {path}: {e}") for path in futures[fut]]
+            for path, text, error in converted:
+                if error is not None:
+                    print(error, file=sys.stderr)
+                    continue
+                out_path = out_paths[path]
+                try:
+                    write_output(out_path, text)
+                except Exception as e:
+                    print(f"Error converting {path}: {e}", file=sys.stderr)
+                    continue
+                print(f"Converted: {path} -> {out_path}")
+                success += 1
 
     print(f"Finished: {success}/{total} files converted successfully")
     return 0
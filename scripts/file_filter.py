@@ -0,0 +1,74 @@
+"""Name-based skip list for folder conversions, shared by batch_convert.py and the Streamlit app."""
+from __future__ import annotations
+import os
+
+# Files that are never documents: OS metadata, temp/lock/backup files, compiled code, libraries, fonts, databases,
+# disk images and compressed formats MarkItDown does not unpack (it only opens .zip).
+NON_DOCUMENT_EXTENSIONS = frozenset(
+    {
+        ".tmp",
+        ".temp",
+        ".bak",
+        ".swp",
+        ".swo",
+        ".lock",
+        ".part",
+        ".crdownload",
+        ".exe",
+        ".dll",
+        ".so",
+        ".dylib",
+        ".o",
+        ".a",
+        ".lib",
+        ".obj",
+        ".pyc",
+        ".pyo",
+        ".class",
+        ".jar",
+        ".wasm",
+        ".ttf",
+        ".otf",
+        ".woff",
+        ".woff2",
+        ".eot",
+        ".db",
+        ".sqlite",
+        ".sqlite3",
+        ".mdb",
+        ".pdb",
+        ".idx",
+        ".pack",
+        ".iso",
+        ".img",
+        ".dmg",
+        ".vhd",
+        ".vmdk",
+        ".gz",
+        ".tgz",
+        ".bz2",
+        ".xz",
+        ".zst",
+        ".7z",
+        ".rar",
+        ".tar",
+    }
+)
+NON_DOCUMENT_NAMES = frozenset(
+    {".ds_store", "thumbs.db", "desktop.ini", ".localized", ".directory"}
+)
+# Office and LibreOffice lock files, macOS AppleDouble resource forks
+NON_DOCUMENT_PREFIXES = ("~$", ".~lock.", "._")
+
+
+def is_convertible_file(path: str) -> bool:
+    """False for files known not to be documents (see NON_DOCUMENT_EXTENSIONS); True for everything else.
+
+    The check is a fixed list on purpose: it gives the same answer on every machine, unlike mimetypes, which reads
+    the host's type tables. Unfamiliar extensions are attempted, because MarkItDown also recognizes files by their
+    content; a file wrongly kept costs one failed conversion, a file wrongly skipped is silently lost.
+    """
+    name = os.path.basename(path).lower()
+    if name in NON_DOCUMENT_NAMES or name.startswith(NON_DOCUMENT_PREFIXES):
+        return False
+    return os.path.splitext(name)[1] not in NON_DOCUMENT_EXTENSIONS
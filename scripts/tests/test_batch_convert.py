@@ -0,0 +1,131 @@
+#!/usr/bin/env python3 -m pytest
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import batch_convert  # noqa: E402
+
+
+def _uring_available() -> bool:
+    if not batch_convert.HAS_LIBURING:
+        return False
+    try:
+        # io_uring can be compiled out or blocked (e.g., by a container's seccomp profile)
+        batch_convert.UringReader().close()
+        return True
+    except OSError:
+        return False
+
+
+skip_uring = pytest.mark.skipif(
+    not _uring_available(), reason="io_uring or liburing is not available"
+)
+
+
+def make_files(root, count: int) -> list:
+    paths = []
+    for i in range(count):
+        path = os.path.join(root, f"file{i}.txt")
+        with open(path, "wb") as fh:
+            fh.write(f"line {i}\n".encode("utf-8") * (i * 37))
+        paths.append(path)
+    return paths
+
+
+def read_plain(path: str):
+    try:
+        with open(path, "rb") as fh:
+            return fh.read()
+    except OSError as e:
+        return type(e)
+
+
+def read_uring(paths: list) -> list:
+    with batch_convert.UringReader() as reader:
+        return [
+            (path, type(data) if isinstance(data, OSError) else bytes(data))
+            for path, data in reader.read_files(paths)
+        ]
+
+
+@skip_uring
+def test_uring_reader_matches_plain_reads(tmp_path) -> None:
+    # More files than one ring batch, plus an empty and a missing file in the middle
+    paths = make_files(tmp_path, batch_convert.URING_BATCH + 6)
+    empty = os.path.join(tmp_path, "empty.txt")
+    open(empty, "wb").close()
+    paths.insert(3, empty)
+    paths.insert(40, os.path.join(tmp_path, "missing.txt"))
+
+    assert read_uring(paths) == [(path, read_plain(path)) for path in paths]
+
+
+@skip_uring
+def test_uring_reader_byte_cap(tmp_path, monkeypatch) -> None:
+    # A tiny cap forces one read group per file, including files larger than the cap
+    monkeypatch.setattr(batch_convert, "URING_BATCH_BYTES", 100)
+    paths = make_files(tmp_path, 10)
+    assert read_uring(paths) == [(path, read_plain(path)) for path in paths]
+
+
+@skip_uring
+def test_uring_reader_file_grew(tmp_path, monkeypatch) -> None:
+    # A file that grows between the statx and the read is read in full, not cut off at the stat'ed size
+    paths = make_files(tmp_path, 3)
+    prep_read = batch_convert.liburing.io_uring_prep_read
+
+    def grow_then_read(sqe, fd, buf, offset):
+        with open(paths[1], "ab") as fh:
+            fh.write(b"more")
+        return prep_read(sqe, fd, buf, offset)
+
+    monkeypatch.setattr(batch_convert.liburing, "io_uring_prep_read", grow_then_read)
+    result = read_uring(paths)
+    assert result == [(path, read_plain(path)) for path in paths]
+    assert result[1][1].endswith(b"more")
+
+
+@pytest.mark.parametrize("io_uring", [False, pytest.param(True, marks=skip_uring)])
+def test_main_converts_folder(tmp_path, capsys, io_uring: bool) -> None:
+    input_dir = tmp_path / "in"
+    output_dir = tmp_path / "out"
+    input_dir.mkdir()
+    paths = make_files(input_dir, 70)
+    open(input_dir / ".DS_Store", "wb").close()
+
+    argv = ["--input", str(input_dir), "--output", str(output_dir)]
+    assert batch_convert.main(argv + (["--io-uring"] if io_uring else [])) == 0
+
+    out = capsys.readouterr().out
+    assert "Skipping 1 file(s)" in out
+    assert f"Finished: {len(paths)}/{len(paths)}" in out
+    for path in paths:
+        md = output_dir / (os.path.splitext(os.path.basename(path))[0] + ".md")
+        assert (
+            md.read_text(encoding="utf-8").strip()
+            == read_plain(path).decode("utf-8").strip()
+        )
+
+
+def test_main_reports_duplicate_outputs(tmp_path, capsys) -> None:
+    # Inputs sharing a stem map to one .md; the first in sorted order keeps it, every run
+    input_dir = tmp_path / "in"
+    output_dir = tmp_path / "out"
+    (input_dir / "sub").mkdir(parents=True)
+    (input_dir / "report.txt").write_text("from txt")
+    (input_dir / "sub" / "report.csv").write_text("a,b")
+    (input_dir / "other.txt").write_text("other")
+
+    argv = ["--input", str(input_dir), "--output", str(output_dir), "--recursive"]
+    assert batch_convert.main(argv) == 0
+
+    captured = capsys.readouterr()
+    assert f"Not converting {input_dir / 'sub' / 'report.csv'}" in captured.err
+    assert "Finished: 2/3" in captured.out
+    assert (output_dir / "report.md").read_text(encoding="utf-8").strip() == "from txt"
+
+
+if __name__ == "__main__":
+    """Runs this file's tests from the command line."""
+    sys.exit(pytest.main([__file__]))
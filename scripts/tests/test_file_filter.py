@@ -0,0 +1,71 @@
+#!/usr/bin/env python3 -m pytest
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from file_filter import is_convertible_file  # noqa: E402
+
+TEST_FILES_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.pardir,
+    os.pardir,
+    "packages",
+    "markitdown",
+    "tests",
+    "test_files",
+)
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "a.pdf",
+        "a.DOCX",
+        "a.py",
+        "a.tsv",
+        "a.yaml",
+        "a.log",
+        "a.ini",
+        "README",
+        "a.unknown",
+        "dir/a.csv",
+    ],
+)
+def test_documents_are_kept(name: str) -> None:
+    assert is_convertible_file(name)
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        ".DS_Store",
+        "sub/Thumbs.db",
+        "desktop.ini",
+        "a.tmp",
+        "a.TMP",
+        "~$report.docx",
+        ".~lock.sheet.xlsx#",
+        "._report.pdf",
+        "a.exe",
+        "a.so",
+        "a.pyc",
+        "a.woff2",
+        "a.sqlite",
+        "a.tar.gz",
+        "a.7z",
+    ],
+)
+def test_non_documents_are_skipped(name: str) -> None:
+    assert not is_convertible_file(name)
+
+
+def test_repo_test_files_are_kept() -> None:
+    # Every fixture the library converts (or deliberately fails on by content) is attempted
+    for name in os.listdir(TEST_FILES_DIR):
+        assert is_convertible_file(os.path.join(TEST_FILES_DIR, name)), name
+
+
+if __name__ == "__main__":
+    """Runs this file's tests from the command line."""
+    sys.exit(pytest.main([__file__]))